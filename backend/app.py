@@ -1,4 +1,4 @@
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, request, jsonify, send_file, Response, stream_with_context, g
 from flask_cors import CORS
 from werkzeug.security import generate_password_hash, check_password_hash
 import jwt
@@ -14,6 +14,16 @@ import google.generativeai as genai
 from dotenv import load_dotenv
 load_dotenv()
 import io
+import sys
+import hmac
+import json
+import time
+import random
+import zipfile
+import threading
+import collections
+import uuid
+import click
 import traceback
 from flask import send_from_directory
 
@@ -39,6 +49,9 @@ def serve(path):
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'your-secret-key-change-in-production')
 app.config['DATABASE'] = os.environ.get('DATABASE_PATH', 'docgen.db')
 
+# Projects written per transaction by bulk import
+BULK_BATCH_SIZE = int(os.environ.get('BULK_BATCH_SIZE', 200))
+
 #(User chose: gemini-2.0-flash-exp)
 GEMINI_API_KEY = os.environ.get('GEMINI_API_KEY', '')
 if not GEMINI_API_KEY:
@@ -54,6 +67,20 @@ except Exception as e:
     MODEL_NAME = None
 
 
+# Per-request profiling. Off (no hooks registered) unless PROFILE_TOKEN or
+# PROFILE_SAMPLE_RATE is set. Send "X-Profile: <PROFILE_TOKEN>" to profile
+# one request, or set PROFILE_SAMPLE_RATE (0-1) to profile a random share.
+PROFILE_DIR = os.environ.get('PROFILE_DIR', 'profiles')
+PROFILE_TOKEN = os.environ.get('PROFILE_TOKEN', '')
+PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', 0))
+PROFILE_INTERVAL = float(os.environ.get('PROFILE_INTERVAL', 0.005))
+# Stop sampling after this long (streamed import/export bodies can run for minutes)
+PROFILE_MAX_SECONDS = float(os.environ.get('PROFILE_MAX_SECONDS', 30))
+# Oldest profiles are deleted once PROFILE_DIR holds more than this many
+PROFILE_MAX_COUNT = int(os.environ.get('PROFILE_MAX_COUNT', 200))
+PROFILING_ENABLED = bool(PROFILE_TOKEN) or PROFILE_SAMPLE_RATE > 0
+
+
 def get_db():
     db = sqlite3.connect(app.config['DATABASE'], timeout=10, check_same_thread=False)
     db.row_factory = sqlite3.Row
@@ -109,6 +136,123 @@ def init_db():
     finally:
         db.close()
 
+class _StackSampler(threading.Thread):
+    """Samples one thread's Python stack at a fixed interval into collapsed stacks."""
+
+    def __init__(self, thread_id, interval, max_seconds):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.max_seconds = max_seconds
+        self.truncated = False
+        self.stacks = collections.Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        deadline = time.perf_counter() + self.max_seconds
+        while not self._stop_event.wait(self.interval):
+            if time.perf_counter() > deadline:
+                self.truncated = True
+                return
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+def _profile_token_matches():
+    """True if the request carries X-Profile: <PROFILE_TOKEN>."""
+    if not PROFILE_TOKEN:
+        return False
+    # Compare bytes: compare_digest rejects non-ASCII str arguments
+    header = request.headers.get('X-Profile', '')
+    return hmac.compare_digest(header.encode('utf-8'), PROFILE_TOKEN.encode('utf-8'))
+
+def _should_profile():
+    if not request.path.startswith('/api/') or request.path.startswith('/api/admin/profiles'):
+        return False
+    if _profile_token_matches():
+        return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+def _write_profile(sampler, duration, status):
+    """Write <name>.folded (flamegraph.pl / speedscope input) and <name>.json metadata."""
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    route = request.url_rule.rule if request.url_rule else request.path
+    name = f"{datetime.utcnow().strftime('%Y%m%dT%H%M%S%f')}-{request.endpoint or 'unknown'}-{uuid.uuid4().hex[:8]}"
+
+    with open(os.path.join(PROFILE_DIR, name + '.folded'), 'w') as f:
+        for stack, count in sampler.stacks.most_common():
+            f.write(f"{stack} {count}\n")
+
+    meta = {
+        'name': name,
+        'method': request.method,
+        'route': route,
+        'path': request.path,
+        'status': status,
+        'duration_ms': round(duration * 1000, 2),
+        'samples': sum(sampler.stacks.values()),
+        'interval_ms': PROFILE_INTERVAL * 1000,
+        'truncated': sampler.truncated,
+        'created_at': datetime.utcnow().isoformat()
+    }
+    with open(os.path.join(PROFILE_DIR, name + '.json'), 'w') as f:
+        json.dump(meta, f)
+
+    _prune_profiles()
+
+def _profile_names():
+    """Captured profile names, newest first (names start with a UTC timestamp)."""
+    if not os.path.isdir(PROFILE_DIR):
+        return []
+    names = [f[:-len('.json')] for f in os.listdir(PROFILE_DIR) if f.endswith('.json')]
+    return sorted(names, reverse=True)
+
+def _prune_profiles():
+    for name in _profile_names()[PROFILE_MAX_COUNT:]:
+        for ext in ('.json', '.folded'):
+            try:
+                os.remove(os.path.join(PROFILE_DIR, name + ext))
+            except OSError:
+                pass
+
+if PROFILING_ENABLED:
+    @app.before_request
+    def _start_profiler():
+        if _should_profile():
+            g.profiler = _StackSampler(threading.get_ident(), PROFILE_INTERVAL, PROFILE_MAX_SECONDS)
+            g.profile_start = time.perf_counter()
+            g.profiler.start()
+
+    @app.after_request
+    def _record_profile_status(response):
+        g.profile_status = response.status_code
+        return response
+
+    @app.teardown_request
+    def _stop_profiler(exc):
+        # With stream_with_context this runs after a streamed body finishes,
+        # so streamed routes are covered; the sampler stops on its own after
+        # PROFILE_MAX_SECONDS to keep long imports/exports bounded.
+        sampler = g.pop('profiler', None)
+        if sampler is None:
+            return
+        duration = time.perf_counter() - g.profile_start
+        sampler.stop()
+        try:
+            _write_profile(sampler, duration, g.get('profile_status', 500))
+        except Exception as e:
+            print("PROFILE WRITE FAILED:", e)
+
+
 #JWT
 def token_required(f):
     @wraps(f)
@@ -201,6 +345,52 @@ def _generate_with_model(prompt, max_output_tokens=512, temperature=0.2):
 
 
 
+def _extract_chunk_text(chunk):
+    """
+    Text of one streamed chunk, or "" if it has none.
+    chunk.text raises ValueError on chunks without text parts (e.g. a final
+    MAX_TOKENS or SAFETY chunk), so read the parts directly.
+    """
+    try:
+        parts = chunk.candidates[0].content.parts
+    except (AttributeError, IndexError):
+        return ""
+    return "".join(getattr(part, "text", "") or "" for part in parts)
+
+def _stream_with_model(prompt, max_output_tokens=512, temperature=0.2):
+    """
+    Streaming variant of _generate_with_model: yields text chunks as they arrive.
+    Errors are raised to the caller so a half-finished stream is never committed.
+    Closing the generator (e.g. on client disconnect) stops reading from Gemini.
+    """
+    if not GEMINI_API_KEY:
+        yield "This is placeholder content. Configure your Gemini API key to generate AI content."
+        return
+
+    model = genai.GenerativeModel(MODEL_NAME)
+    response = model.generate_content(
+        prompt,
+        generation_config={
+            "max_output_tokens": max_output_tokens,
+            "temperature": temperature
+        },
+        stream=True
+    )
+
+    try:
+        for chunk in response:
+            text = _extract_chunk_text(chunk)
+            if text:
+                yield text
+    finally:
+        # Drop the upstream stream if we stopped early. google-generativeai
+        # 0.3.2 has no public cancel; _iterator is the gRPC call object, so
+        # this only works with the gRPC transport (the default).
+        iterator = getattr(response, "_iterator", None)
+        if hasattr(iterator, "cancel"):
+            iterator.cancel()
+
+
 def generate_content_with_ai(topic, section_title, document_type):
     try:
         if document_type == 'docx':
@@ -231,11 +421,10 @@ Format:
     except:
         return "AI generation failed. Configure Gemini API properly."
 
-def refine_content_with_ai(current_content, refinement_prompt, document_type):
-    try:
-        bullet_rule = "Keep bullet format with • symbols." if document_type == "pptx" else ""
-        
-        prompt = f"""
+def _build_refine_prompt(current_content, refinement_prompt, document_type):
+    bullet_rule = "Keep bullet format with • symbols." if document_type == "pptx" else ""
+
+    return f"""
 Refine the following content based on user request.
 
 Original content:
@@ -248,10 +437,19 @@ User wants:
 Return ONLY the refined text.
 """
 
+def refine_content_with_ai(current_content, refinement_prompt, document_type):
+    try:
+        prompt = _build_refine_prompt(current_content, refinement_prompt, document_type)
         return _generate_with_model(prompt, max_output_tokens=400)
 
     except:
         return current_content
+
+def refine_content_with_ai_stream(current_content, refinement_prompt, document_type):
+    """Yield refined text chunks as Gemini produces them."""
+    prompt = _build_refine_prompt(current_content, refinement_prompt, document_type)
+    return _stream_with_model(prompt, max_output_tokens=400)
+
 def suggest_outline_with_ai(topic, document_type):
     try:
         if document_type == 'docx':
@@ -395,11 +593,10 @@ def create_project(current_user_id):
         )
         project_id = cursor.lastrowid
         
-        for idx, section_title in enumerate(outline):
-            db.execute(
-                'INSERT INTO sections (project_id, title, order_index) VALUES (?, ?, ?)',
-                (project_id, section_title, idx)
-            )
+        db.executemany(
+            'INSERT INTO sections (project_id, title, order_index) VALUES (?, ?, ?)',
+            [(project_id, section_title, idx) for idx, section_title in enumerate(outline)]
+        )
         db.commit()
         
         project = db.execute('SELECT * FROM projects WHERE id = ?', (project_id,)).fetchone()
@@ -407,6 +604,59 @@ def create_project(current_user_id):
     finally:
         db.close()
 
+@app.route('/api/projects/import', methods=['POST'])
+@token_required
+def import_projects(current_user_id):
+    """
+    Bulk import. The body is JSONL, one project per line. Progress is streamed
+    back as JSON lines; after a failure, resend with ?start_line=<next_line>.
+    """
+    start_line = request.args.get('start_line', 0, type=int)
+    batch_size = request.args.get('batch_size', BULK_BATCH_SIZE, type=int)
+    if start_line < 0 or batch_size < 1:
+        return jsonify({'error': 'Invalid start_line or batch_size'}), 400
+
+    def generate():
+        db = get_db()
+        try:
+            for event in import_projects_jsonl(db, current_user_id, request.stream, start_line, batch_size):
+                yield json.dumps(event) + "\n"
+        finally:
+            db.close()
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@app.route('/api/projects/export', methods=['GET'])
+@token_required
+def export_projects(current_user_id):
+    """Stream all of the user's projects as JSONL, or as a ZIP of rendered files."""
+    export_format = request.args.get('format', 'jsonl')
+    if export_format not in ['jsonl', 'zip']:
+        return jsonify({'error': 'Invalid export format'}), 400
+
+    def generate():
+        db = get_db()
+        try:
+            if export_format == 'jsonl':
+                for line in export_projects_jsonl(db, current_user_id):
+                    yield line
+            else:
+                for chunk in export_projects_zip(db, current_user_id):
+                    yield chunk
+        finally:
+            db.close()
+
+    if export_format == 'jsonl':
+        mimetype, download_name = 'application/x-ndjson', 'projects.jsonl'
+    else:
+        mimetype, download_name = 'application/zip', 'projects.zip'
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename="{download_name}"'}
+    )
+
 @app.route('/api/projects/<int:project_id>', methods=['DELETE'])
 @token_required
 def delete_project(current_user_id, project_id):
@@ -523,6 +773,80 @@ def refine_section(current_user_id, section_id):
     finally:
         db.close()
 
+@app.route('/api/sections/<int:section_id>/refine/stream', methods=['POST'])
+@token_required
+def refine_section_stream(current_user_id, section_id):
+    """
+    Same as refine_section, but relays Gemini chunks to the client as
+    Server-Sent Events. The section and its history are only written once
+    the stream has finished cleanly.
+    """
+    data = request.get_json() or {}
+    prompt = data.get('prompt')
+    if not prompt:
+        return jsonify({'error': 'Prompt is required'}), 400
+
+    db = get_db()
+    try:
+        section = db.execute('''
+            SELECT s.*, p.user_id, p.document_type 
+            FROM sections s 
+            JOIN projects p ON s.project_id = p.id 
+            WHERE s.id = ?
+        ''', (section_id,)).fetchone()
+        if not section or section['user_id'] != current_user_id:
+            return jsonify({'error': 'Section not found'}), 404
+
+        previous_content = section['content'] or ""
+        document_type = section['document_type']
+    finally:
+        db.close()
+
+    def sse(event, payload):
+        return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+    def generate():
+        chunks = []
+        # Closing this generator on client disconnect closes the upstream stream too
+        stream = refine_content_with_ai_stream(previous_content, prompt, document_type)
+        try:
+            for text in stream:
+                chunks.append(text)
+                yield sse('chunk', {'text': text})
+        except Exception as e:
+            print("REFINE STREAM ERROR:", e)
+            traceback.print_exc()
+            yield sse('error', {'error': 'Refinement failed', 'details': str(e)})
+            return
+        finally:
+            stream.close()
+
+        new_content = "".join(chunks).strip()
+        if not new_content:
+            # Never replace the section with an empty refinement
+            yield sse('error', {'error': 'Refinement failed', 'details': 'Model returned no text'})
+            return
+
+        # Commit only after a clean finish
+        db = get_db()
+        try:
+            db.execute(
+                'INSERT INTO refinement_history (section_id, prompt, previous_content, new_content) VALUES (?, ?, ?, ?)',
+                (section_id, prompt, previous_content, new_content)
+            )
+            db.execute('UPDATE sections SET content = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?', (new_content, section_id))
+            db.commit()
+        finally:
+            db.close()
+
+        yield sse('done', {'content': new_content})
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 @app.route('/api/sections/<int:section_id>/feedback', methods=['POST'])
 @token_required
 def update_feedback(current_user_id, section_id):
@@ -580,6 +904,266 @@ def suggest_outline(current_user_id):
     return jsonify({'outline': outline})
 
 
+@app.route('/api/admin/profiles', methods=['GET'])
+def list_profiles():
+    """List the newest ?limit= (default 50) captured profiles. Requires X-Profile: <PROFILE_TOKEN>."""
+    if not _profile_token_matches():
+        return jsonify({'error': 'Not found'}), 404
+
+    limit = min(max(request.args.get('limit', 50, type=int), 1), PROFILE_MAX_COUNT)
+
+    profiles = []
+    for name in _profile_names()[:limit]:
+        try:
+            with open(os.path.join(PROFILE_DIR, name + '.json')) as f:
+                profiles.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return jsonify({'profiles': profiles, 'directory': os.path.abspath(PROFILE_DIR)})
+
+
+# Bulk import / export
+
+def _parse_project_line(raw):
+    """Parse one JSONL project record. Raises ValueError if it is invalid."""
+    record = json.loads(raw)
+    if not isinstance(record, dict):
+        raise ValueError("Project record must be a JSON object")
+
+    document_type = record.get('document_type')
+    title = record.get('title')
+    topic = record.get('topic')
+    if not document_type or not title or not topic:
+        raise ValueError("Missing required fields")
+    if document_type not in ['docx', 'pptx']:
+        raise ValueError("Invalid document type")
+
+    # Accept full exported sections, or a bare outline like create_project
+    sections = record.get('sections')
+    if sections is None:
+        outline = record.get('outline', [])
+        if not isinstance(outline, list):
+            raise ValueError("outline must be a list")
+        sections = [{'title': section_title} for section_title in outline]
+    if not isinstance(sections, list):
+        raise ValueError("sections must be a list")
+
+    rows = []
+    for idx, section in enumerate(sections):
+        if not isinstance(section, dict) or not section.get('title'):
+            raise ValueError("Each section needs a title")
+        rows.append((
+            section['title'],
+            section.get('content'),
+            section.get('order_index', idx),
+            section.get('liked'),
+            section.get('comment'),
+        ))
+    return (document_type, title, topic), rows
+
+def _write_project_batch(db, user_id, batch):
+    """
+    Insert already-parsed projects in one transaction. Does no I/O, so
+    SQLite's write lock is only held for the inserts themselves.
+    """
+    try:
+        for project, sections in batch:
+            cursor = db.execute(
+                'INSERT INTO projects (user_id, document_type, title, topic) VALUES (?, ?, ?, ?)',
+                (user_id,) + project
+            )
+            db.executemany(
+                'INSERT INTO sections (project_id, title, content, order_index, liked, comment) VALUES (?, ?, ?, ?, ?, ?)',
+                [(cursor.lastrowid,) + row for row in sections]
+            )
+        db.commit()
+    except sqlite3.Error:
+        db.rollback()
+        raise
+
+def import_projects_jsonl(db, user_id, lines, start_line=0, batch_size=BULK_BATCH_SIZE):
+    """
+    Insert JSONL projects for user_id, committing every batch_size projects.
+    Each batch is read and parsed before any write, so a slow reader never
+    holds the write lock. Yields a progress event after each commit. Lines up
+    to start_line are skipped, so a stopped import resumes from the last
+    reported next_line.
+    """
+    imported = 0
+    line_no = 0
+    committed_line = start_line
+    batch = []
+    try:
+        for raw in lines:
+            line_no += 1
+            if line_no <= start_line:
+                continue
+            if isinstance(raw, bytes):
+                raw = raw.decode('utf-8')
+            if raw.strip():
+                batch.append(_parse_project_line(raw))
+
+            if len(batch) >= batch_size:
+                _write_project_batch(db, user_id, batch)
+                imported += len(batch)
+                batch = []
+                committed_line = line_no
+                yield {'event': 'progress', 'imported': imported, 'next_line': committed_line}
+
+        _write_project_batch(db, user_id, batch)
+        imported += len(batch)
+        committed_line = max(line_no, start_line)
+        yield {'event': 'done', 'imported': imported, 'next_line': committed_line}
+
+    except (ValueError, sqlite3.Error) as e:
+        # The unwritten batch is dropped; everything before committed_line is stored
+        yield {
+            'event': 'error',
+            'line': line_no,
+            'error': str(e),
+            'imported': imported,
+            'next_line': committed_line
+        }
+
+def _iter_user_projects(db, user_id, page_size=BULK_BATCH_SIZE):
+    """
+    Yield (project, sections) one project at a time. Projects are paged by id
+    and fully fetched, so no statement (and no SQLite read lock) stays open
+    while the caller is streaming to a slow client.
+    """
+    last_id = 0
+    while True:
+        projects = db.execute(
+            'SELECT * FROM projects WHERE user_id = ? AND id > ? ORDER BY id LIMIT ?',
+            (user_id, last_id, page_size)
+        ).fetchall()
+        if not projects:
+            return
+        for project in projects:
+            sections = db.execute(
+                'SELECT * FROM sections WHERE project_id = ? ORDER BY order_index',
+                (project['id'],)
+            ).fetchall()
+            yield project, sections
+        last_id = projects[-1]['id']
+
+def export_projects_jsonl(db, user_id):
+    """Yield one JSON line per project, in the format import_projects_jsonl reads."""
+    for project, sections in _iter_user_projects(db, user_id):
+        record = {
+            'id': project['id'],
+            'document_type': project['document_type'],
+            'title': project['title'],
+            'topic': project['topic'],
+            'created_at': project['created_at'],
+            'updated_at': project['updated_at'],
+            'sections': [
+                {
+                    'title': s['title'],
+                    'content': s['content'],
+                    'order_index': s['order_index'],
+                    'liked': s['liked'],
+                    'comment': s['comment']
+                }
+                for s in sections
+            ]
+        }
+        yield json.dumps(record) + "\n"
+
+class _ZipSink:
+    """Write-only file object so zipfile can emit an archive piece by piece."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+def _export_filename(project):
+    safe_title = "".join(c if c.isalnum() or c in " -_" else "_" for c in project['title']).strip()
+    return f"{project['id']}-{safe_title or 'untitled'}.{project['document_type']}"
+
+def export_projects_zip(db, user_id):
+    """Yield a ZIP of rendered docx/pptx files, holding one document in memory at a time."""
+    sink = _ZipSink()
+    # docx/pptx are already compressed, so store them as-is
+    with zipfile.ZipFile(sink, 'w', zipfile.ZIP_STORED) as zf:
+        for project, sections in _iter_user_projects(db, user_id):
+            if project['document_type'] == 'docx':
+                file_obj = create_docx(project, sections)
+            else:
+                file_obj = create_pptx(project, sections)
+            zf.writestr(_export_filename(project), file_obj.getvalue())
+            yield sink.drain()
+    yield sink.drain()
+
+def _get_user_id_by_email(db, email):
+    user = db.execute('SELECT id FROM users WHERE email = ?', (email,)).fetchone()
+    if not user:
+        raise click.ClickException(f"No user with email {email}")
+    return user['id']
+
+@app.cli.command('import-projects')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--email', required=True, help='Owner of the imported projects.')
+@click.option('--batch-size', default=BULK_BATCH_SIZE, show_default=True, help='Projects per transaction.')
+@click.option('--start-line', type=int, default=None, help='Skip this many lines (overrides the checkpoint).')
+def import_projects_command(path, email, batch_size, start_line):
+    """Import JSONL projects from PATH, resuming from PATH.checkpoint if present."""
+    checkpoint = path + '.checkpoint'
+    if start_line is None:
+        start_line = 0
+        if os.path.exists(checkpoint):
+            with open(checkpoint) as f:
+                start_line = int(f.read().strip() or 0)
+            click.echo(f"Resuming from line {start_line}", err=True)
+
+    init_db()
+    db = get_db()
+    try:
+        user_id = _get_user_id_by_email(db, email)
+        with open(path, encoding='utf-8') as f:
+            for event in import_projects_jsonl(db, user_id, f, start_line, batch_size):
+                with open(checkpoint, 'w') as cp:
+                    cp.write(str(event['next_line']))
+                if event['event'] == 'error':
+                    raise click.ClickException(f"Line {event['line']}: {event['error']} (imported {event['imported']}, rerun to resume from line {event['next_line']})")
+                click.echo(f"Imported {event['imported']} projects (line {event['next_line']})", err=True)
+
+        os.remove(checkpoint)
+    finally:
+        db.close()
+
+@app.cli.command('export-projects')
+@click.argument('output', type=click.Path(dir_okay=False))
+@click.option('--email', required=True, help='Owner of the exported projects.')
+@click.option('--format', 'export_format', type=click.Choice(['jsonl', 'zip']), default='jsonl', show_default=True)
+def export_projects_command(output, email, export_format):
+    """Export a user's projects to OUTPUT as JSONL or a ZIP of documents."""
+    db = get_db()
+    try:
+        user_id = _get_user_id_by_email(db, email)
+        if export_format == 'jsonl':
+            chunks, mode = export_projects_jsonl(db, user_id), 'w'
+        else:
+            chunks, mode = export_projects_zip(db, user_id), 'wb'
+        with open(output, mode) as f:
+            for chunk in chunks:
+                f.write(chunk)
+        click.echo(f"Wrote {output}", err=True)
+    finally:
+        db.close()
+
+
 # Export / Create DOCX / PPTX
 
 @app.route('/api/projects/<int:project_id>/export', methods=['GET'])